@@ -5,6 +5,10 @@ import sys
 import pygame.gfxdraw  # For anti-aliased drawing
 import re
 import math
+import functools
+import threading
+import numpy as np
+from collections import Counter
 
 # === Configuration ===
 WIDTH, HEIGHT = 800, 600  # Larger window for better visuals
@@ -14,6 +18,7 @@ DEAD_ZONE = 150  # Joystick dead zone
 GYRO_DEADZONE = 150  # MPU6050 gyro dead zone
 GYRO_SCALE = 0.0003  # MPU6050 sensitivity
 GYRO_SMOOTHING = 0.9  # MPU6050 smoothing factor
+DEBUG = False  # Print per-frame diagnostics (sound events, serial parse errors)
 
 # Colors (Jungle theme)
 BG_COLOR = (10, 50, 20)  # Dark green
@@ -71,7 +76,7 @@ except FileNotFoundError:
 # Optional background image (create/download 'jungle_bg.png')
 try:
     background_image = pygame.image.load('jungle_bg.png')
-    background_image = pygame.transform.scale(background_image, (WIDTH, HEIGHT))
+    background_image = pygame.transform.scale(background_image, (WIDTH, HEIGHT)).convert()  # Match display format for fast blits
 except FileNotFoundError:
     background_image = None
 
@@ -101,36 +106,113 @@ def save_high_score(score):
     global high_score
     if score > high_score:
         high_score = score
-        with open(HIGH_SCORE_FILE, 'w') as f:
-            f.write(str(high_score))
+
+# Only written on game over and quit, not on every point scored
+def write_high_score():
+    with open(HIGH_SCORE_FILE, 'w') as f:
+        f.write(str(high_score))
+
+# Fonts by id, so rendered text can be cached on hashable keys
+_fonts = {id(f): f for f in (font, title_font, small_font)}
+
+@functools.lru_cache(maxsize=256)
+def _render(font_id, text, color):
+    return _fonts[font_id].render(text, True, color).convert_alpha()
 
 def draw_text(text, font, color, surface, x, y, center=False):
-    txt_obj = font.render(text, True, color)
+    txt_obj = _render(id(font), text, color)
     txt_rect = txt_obj.get_rect()
     if center:
         txt_rect.center = (x, y)
     else:
         txt_rect.topleft = (x, y)
-    surface.blit(txt_obj, txt_rect)
-
-def random_food_position(snake, obstacles):
-    while True:
-        x = random.randint(0, (WIDTH // CELL_SIZE) - 1)
-        y = random.randint(0, (HEIGHT // CELL_SIZE) - 1)
-        pos = (x * CELL_SIZE, y * CELL_SIZE)
-        if pos not in snake and pos not in obstacles:
-            return pos
-
-def draw_grid():
+    return surface.blit(txt_obj, txt_rect)
+
+# Cells not covered by snake or obstacles; the index allows O(1) swap-remove
+ALL_CELLS = [(x * CELL_SIZE, y * CELL_SIZE) for x in range(WIDTH // CELL_SIZE) for y in range(HEIGHT // CELL_SIZE)]
+free_cells = []
+free_index = {}
+
+def reset_free_cells(occupied):
+    free_cells[:] = [cell for cell in ALL_CELLS if cell not in occupied]
+    free_index.clear()
+    free_index.update((cell, i) for i, cell in enumerate(free_cells))
+
+def occupy_cell(pos):
+    i = free_index.pop(pos, None)
+    if i is None:  # Already occupied or off the board
+        return
+    last = free_cells.pop()
+    if i < len(free_cells):
+        free_cells[i] = last
+        free_index[last] = i
+
+def release_cell(pos):
+    # Still covered by a snake segment or a rock
+    if snake_cells[pos] or pos in obstacles_set:
+        return
+    if pos not in free_index:
+        free_index[pos] = len(free_cells)
+        free_cells.append(pos)
+
+def random_food_position():
+    return random.choice(free_cells)  # Callers must check free_cells is non-empty
+
+def draw_grid(surface):
     for x in range(0, WIDTH, CELL_SIZE):
-        pygame.draw.line(screen, GRID_COLOR, (x, 0), (x, HEIGHT))
+        pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, HEIGHT))
     for y in range(0, HEIGHT, CELL_SIZE):
-        pygame.draw.line(screen, GRID_COLOR, (0, y), (WIDTH, y))
+        pygame.draw.line(surface, GRID_COLOR, (0, y), (WIDTH, y))
+
+# Pre-rendered circle sprites, keyed by (radius, color, shine color)
+_circle_sprites = {}
+
+def circle_sprite(radius, color, shine=None):
+    key = (radius, color, shine)
+    sprite = _circle_sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        if shine:
+            pygame.gfxdraw.aacircle(sprite, radius, radius, radius - 2, shine)
+        _circle_sprites[key] = sprite = sprite.convert_alpha()
+    return sprite
+
+def circle_blit(center, radius, color, shine=None):
+    return (circle_sprite(radius, color, shine), (center[0] - radius, center[1] - radius))
+
+# Eye positions relative to the head center, per movement direction
+_eo = CELL_SIZE // 4
+EYE_OFFSETS = {
+    (1, 0): ((_eo, -(_eo // 2)), (_eo, _eo // 2)),  # Right
+    (-1, 0): ((-_eo, -(_eo // 2)), (-_eo, _eo // 2)),  # Left
+    (0, 1): ((-(_eo // 2), _eo), (_eo // 2, _eo)),  # Down
+    (0, -1): ((-(_eo // 2), -_eo), (_eo // 2, -_eo)),  # Up
+    (0, 0): ((-(_eo // 2), -_eo), (_eo // 2, -_eo)),  # Still
+}
+
+# Grid never changes, so rasterize it once and blit it each frame.
+# Without a background image it is drawn on an opaque BG_COLOR base,
+# so one blit paints both background and lines.
+if background_image:
+    grid_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    draw_grid(grid_surf)
+    grid_surf = grid_surf.convert_alpha()
+else:
+    grid_surf = pygame.Surface((WIDTH, HEIGHT))
+    grid_surf.fill(BG_COLOR)
+    draw_grid(grid_surf)
+    grid_surf = grid_surf.convert()
+
+# Static HUD title, rendered once
+title_surf = title_font.render("Super Noah-Snake-Game", True, TITLE_COLOR).convert_alpha()
 
 # Game variables
 snake = [(WIDTH // 2, HEIGHT // 2)]
+snake_cells = Counter(snake)  # Segments per cell; power-ups let the snake overlap itself
 direction = (0, 0)
-food_pos = random_food_position(snake, [])
+reset_free_cells(snake)
+food_pos = random_food_position()
 food_type = 'normal'  # 'normal' or 'power'
 score = 0
 game_over = False
@@ -138,13 +220,63 @@ paused = False
 show_grid = True
 level = 1
 obstacles = []  # For higher levels
+obstacles_set = set()  # Rock cells stay occupied even if the snake passes over them
 powerup_active = False
 powerup_timer = 0
-particles = []  # For eat effects
+# Particles for eat effects, stored as parallel arrays (position, velocity, life)
+p_pos = np.empty((0, 2), dtype=np.float32)
+p_vel = np.empty((0, 2), dtype=np.float32)
+p_life = np.empty(0, dtype=np.int16)
+dirty = []  # Screen areas drawn last frame, repainted and presented this frame
+full_redraw = True  # Repaint and present the whole screen next frame
+hud_surf = None  # Score line, re-rendered only when its values change
+_last_hud_state = None
 
 # Joystick calibration (assume center is 512; adjust if needed)
 joy_center_x, joy_center_y = 512, 512
 
+# Latest joystick sample (X, Y, button), written by the serial thread
+_joy_state = [joy_center_x, joy_center_y, 1]
+_joy_lock = threading.Lock()
+
+def _serial_worker():
+    held = False
+    pending = b''  # Bytes of a line cut off by the read timeout
+    while ser_joystick.is_open:
+        try:
+            pending += ser_joystick.readline()
+            if not pending.endswith(b'\n'):
+                continue  # Partial line, finish it on the next read
+            line, pending = pending, b''
+            data = line.decode().strip()
+            if data:  # Ensure data is not empty
+                joyX, joyY, button = data.split(',')  # Expect X,Y,B
+                sample = (int(joyX), int(joyY))
+                pressed = int(button) == 0 and not held  # Only the press edge, not every held sample
+                held = int(button) == 0
+                with _joy_lock:
+                    _joy_state[:2] = sample
+                    if pressed:
+                        _joy_state[2] = 0  # Latched until read_joystick() consumes it
+        except (ValueError, UnicodeDecodeError) as e:
+            if DEBUG:
+                print(f"Joystick serial error: {e}")
+        except serial.SerialException:
+            break  # Port closed on exit
+
+def read_joystick():
+    with _joy_lock:
+        state = tuple(_joy_state)
+        _joy_state[2] = 1  # Consume the press so a stale sample doesn't toggle again
+    return state
+
+def clear_joystick_press():
+    with _joy_lock:
+        _joy_state[2] = 1  # Drop a press nobody was around to consume
+
+if ser_joystick:
+    threading.Thread(target=_serial_worker, daemon=True).start()
+
 # MPU6050 smoothed values
 gX_smooth = 0
 gY_smooth = 0
@@ -156,50 +288,42 @@ gyro_pattern = re.compile(r'gX\s*=\s*(-?\d+)\s*\|\s*gY\s*=\s*(-?\d+)\s*\|\s*gZ\s
 # Control mode: 0 = Joystick/Keyboard, 1 = MPU6050
 control_mode = 0
 
+# Keyboard direction, updated from KEYDOWN events instead of polling key state
+KEY_DIRECTIONS = {
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+}
+key_dir = (0, 0)
+restart_pressed = False
+
 def get_direction():
-    global direction, paused, gX_smooth, gY_smooth, gZ_smooth
+    global direction, paused, full_redraw, gX_smooth, gY_smooth, gZ_smooth
     dx, dy = 0, 0
 
     if control_mode == 0:  # Joystick/Keyboard mode
         if ser_joystick:  # Joystick mode
-            try:
-                data = ser_joystick.readline().decode().strip()
-                if data:  # Ensure data is not empty
-                    values = data.split(',')
-                    if len(values) == 3:  # Expect X,Y,B
-                        joyX = int(values[0]) - joy_center_x
-                        joyY = int(values[1]) - joy_center_y
-                        button = int(values[2])
-
-                        if button == 0:  # Button pressed (LOW due to pull-up)
-                            paused = not paused
-
-                        if abs(joyX) > DEAD_ZONE:
-                            dx = 1 if joyX > 0 else -1
-                        if abs(joyY) > DEAD_ZONE:
-                            dy = 1 if joyY > 0 else -1
-
-                        # No diagonals
-                        if dx != 0:
-                            dy = 0
+            joyX, joyY, button = read_joystick()
+            joyX -= joy_center_x
+            joyY -= joy_center_y
 
-                        return (dx, dy)
-            except (ValueError, UnicodeDecodeError) as e:
-                print(f"Joystick serial error: {e}")
-            return direction  # Fallback to current direction
-        else:  # Keyboard fallback
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                dx, dy = -1, 0
-            elif keys[pygame.K_RIGHT]:
-                dx, dy = 1, 0
-            elif keys[pygame.K_UP]:
-                dx, dy = 0, -1
-            elif keys[pygame.K_DOWN]:
-                dx, dy = 0, 1
-            if keys[pygame.K_p]:
+            if button == 0:  # Button pressed (LOW due to pull-up)
                 paused = not paused
+                full_redraw = True
+
+            if abs(joyX) > DEAD_ZONE:
+                dx = 1 if joyX > 0 else -1
+            if abs(joyY) > DEAD_ZONE:
+                dy = 1 if joyY > 0 else -1
+
+            # No diagonals
+            if dx != 0:
+                dy = 0
+
             return (dx, dy)
+        else:  # Keyboard fallback (pause is handled in the event loop)
+            return key_dir
 
     elif control_mode == 1:  # MPU6050 mode
         if ser_mpu:
@@ -233,11 +357,20 @@ def get_direction():
 
                         return (dx, dy)
             except (ValueError, UnicodeDecodeError) as e:
-                print(f"MPU serial error: {e}")
+                if DEBUG:
+                    print(f"MPU serial error: {e}")
         return direction  # Fallback
 
     return (dx, dy)
 
+def draw_background(rect):
+    if background_image:  # Image covers every pixel, so no fill needed
+        screen.blit(background_image, rect, rect)
+    elif not show_grid:  # Opaque grid surface already includes BG_COLOR
+        screen.fill(BG_COLOR, rect)
+    if show_grid:
+        screen.blit(grid_surf, rect, rect)
+
 # Menu screen
 def show_menu():
     screen.fill(BG_COLOR)
@@ -258,17 +391,16 @@ while waiting:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             sys.exit()
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_SPACE] or get_direction() != (0, 0):  # Start on key or joystick move
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                waiting = False
+            if event.key in KEY_DIRECTIONS:
+                key_dir = KEY_DIRECTIONS[event.key]
+    if get_direction() != (0, 0):  # Start on key or joystick move
         waiting = False
+    clock.tick(30)  # get_direction() no longer blocks on serial, so throttle the menu loop
 
 while True:
-    screen.fill(BG_COLOR)
-    if background_image:
-        screen.blit(background_image, (0, 0))
-    if show_grid:
-        draw_grid()
-
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             if ser_joystick:
@@ -276,24 +408,53 @@ while True:
             if ser_mpu:
                 ser_mpu.close()
             save_high_score(score)
+            write_high_score()
             pygame.quit()
             sys.exit()
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):  # Window uncovered or restored
+            full_redraw = True
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_g:
                 show_grid = not show_grid
+                full_redraw = True
             if event.key == pygame.K_p:
                 paused = not paused
+                full_redraw = True
             if event.key == pygame.K_f:
                 pygame.display.toggle_fullscreen()
+                full_redraw = True
             if event.key == pygame.K_m:  # Toggle control mode
                 control_mode = 1 - control_mode  # Switch between 0 and 1
+                clear_joystick_press()
+            if event.key in KEY_DIRECTIONS:
+                key_dir = KEY_DIRECTIONS[event.key]
+            if event.key == pygame.K_r and game_over:
+                restart_pressed = True
+
+    # get_direction() isn't called while paused, so check the joystick button here
+    if paused and control_mode == 0 and ser_joystick and read_joystick()[2] == 0:
+        paused = False
+        full_redraw = True
 
     if paused:
-        draw_text("Paused", title_font, TEXT_COLOR, screen, WIDTH // 2, HEIGHT // 2, center=True)
-        pygame.display.flip()
-        clock.tick(5)
+        if full_redraw:  # Draw the pause screen once (again after a window expose)
+            draw_background(screen.get_rect())
+            draw_text("Paused", title_font, TEXT_COLOR, screen, WIDTH // 2, HEIGHT // 2, center=True)
+            pygame.display.flip()
+            full_redraw = False
+        clock.tick(30)  # Sample input often so unpausing is responsive
         continue
 
+    # Repaint the whole background after full-screen changes, otherwise only where last frame drew
+    if full_redraw or game_over:
+        draw_background(screen.get_rect())
+        flip_frame, full_redraw = True, False
+    else:
+        for rect in dirty:
+            draw_background(rect)
+        flip_frame = False
+    restored, dirty = dirty, []
+
     if not game_over:
         new_dir = get_direction()
         # Prevent reversing
@@ -309,44 +470,62 @@ while True:
                 new_head[1] < 0 or new_head[1] >= HEIGHT):
                 game_over = True
                 if game_over_sound:
-                    print("Playing collision_sound.wav for game over")
+                    if DEBUG:
+                        print("Playing collision_sound.wav for game over")
                     game_over_sound.play()
 
-            # Self or obstacle collision (unless powerup active)
-            if not powerup_active and (new_head in snake or new_head in obstacles):
+            # Self or obstacle collision (unless powerup active): any on-board cell outside the free pool
+            elif not powerup_active and new_head not in free_index:
                 game_over = True
                 if game_over_sound:
-                    print("Playing collision_sound.wav for game over")
+                    if DEBUG:
+                        print("Playing collision_sound.wav for game over")
                     game_over_sound.play()
 
+            if game_over:
+                write_high_score()
+
             snake.insert(0, new_head)
+            snake_cells[new_head] += 1
+            occupy_cell(new_head)
 
             # Eat food
             if new_head == food_pos:
                 score += 1
                 save_high_score(score)
                 if eat_sound:
-                    print("Playing collect_sound.wav for eat")
+                    if DEBUG:
+                        print("Playing collect_sound.wav for eat")
                     eat_sound.play()
                 # Particles for effect
                 food_center = (food_pos[0] + CELL_SIZE // 2, food_pos[1] + CELL_SIZE // 2)
-                for _ in range(20):
-                    particles.append([[food_center[0], food_center[1]], [random.randint(-5, 5), random.randint(-5, 5)], random.randint(10, 20)])
+                p_pos = np.concatenate((p_pos, np.full((20, 2), food_center, dtype=np.float32)))
+                p_vel = np.concatenate((p_vel, np.random.randint(-5, 6, (20, 2)).astype(np.float32)))
+                p_life = np.concatenate((p_life, np.random.randint(10, 21, 20).astype(np.int16)))
                 if food_type == 'power':
                     powerup_active = True
                     powerup_timer = 60  # ~15 seconds at 4 FPS
                     if powerup_sound:
-                        print("Playing collect_sound.wav for power-up")
+                        if DEBUG:
+                            print("Playing collect_sound.wav for power-up")
                         powerup_sound.play()
                     FPS = 6  # Slow power-up speed
                 else:
                     # Grow (don't pop tail)
                     pass
                 # Spawn new food, 10% chance power-up
-                food_pos = random_food_position(snake, obstacles)
-                food_type = 'power' if random.random() < 0.1 else 'normal'
+                if free_cells:
+                    food_pos = random_food_position()
+                    food_type = 'power' if random.random() < 0.1 else 'normal'
+                else:  # Board is full, nowhere left to grow
+                    game_over = True
+                    write_high_score()
             else:
-                snake.pop()
+                tail = snake.pop()
+                snake_cells[tail] -= 1
+                if not snake_cells[tail]:
+                    del snake_cells[tail]
+                release_cell(tail)
 
             # Level progression
             if score // 10 + 1 > level:
@@ -354,9 +533,15 @@ while True:
                 FPS += 0.25  # Slower speed increment
                 # Add obstacles
                 for _ in range(level):
-                    obstacles.append(random_food_position(snake, obstacles))  # Random walls
+                    if not free_cells:
+                        break
+                    obs = random_food_position()  # Random walls
+                    obstacles.append(obs)
+                    obstacles_set.add(obs)
+                    occupy_cell(obs)
                 if levelup_sound:
-                    print("Playing collision_sound.wav for level-up")
+                    if DEBUG:
+                        print("Playing collision_sound.wav for level-up")
                     levelup_sound.play()
 
         # Power-up timer
@@ -366,70 +551,80 @@ while True:
                 powerup_active = False
                 FPS = 4  # Reset to very slow base speed
 
+    blit_seq = []
+
     # Draw obstacles as rocks (gray circles)
     for obs in obstacles:
         obs_center = (obs[0] + CELL_SIZE // 2, obs[1] + CELL_SIZE // 2)
-        pygame.gfxdraw.filled_circle(screen, *obs_center, CELL_SIZE // 2, (100, 100, 100))
+        blit_seq.append(circle_blit(obs_center, CELL_SIZE // 2, (100, 100, 100)))
 
     # Draw food
     food_center = (food_pos[0] + CELL_SIZE // 2, food_pos[1] + CELL_SIZE // 2)
     color = POWERUP_COLOR if food_type == 'power' else FOOD_COLOR
-    pygame.gfxdraw.filled_circle(screen, *food_center, CELL_SIZE // 2, color)
-    pygame.gfxdraw.aacircle(screen, *food_center, CELL_SIZE // 2 - 2, (255, 255, 255))  # Shine
+    blit_seq.append(circle_blit(food_center, CELL_SIZE // 2, color, (255, 255, 255)))  # Shine
 
     # Draw snake
-    for i, segment in enumerate(snake):
-        seg_center = (segment[0] + CELL_SIZE // 2, segment[1] + CELL_SIZE // 2)
-        radius = CELL_SIZE // 2 - (i // len(snake) * 2)  # Slight taper
-        snake_color = SNAKE_COLOR if not powerup_active else (255, 255, 0)  # Glow if powerup
-        pygame.gfxdraw.filled_circle(screen, *seg_center, radius, snake_color)
-        if i == 0:  # Head with eyes
-            eye_offset = CELL_SIZE // 4
-            eye_color = (255, 255, 255)
-            if direction[0] > 0:  # Right
-                eyes = [(seg_center[0] + eye_offset, seg_center[1] - eye_offset // 2), (seg_center[0] + eye_offset, seg_center[1] + eye_offset // 2)]
-            elif direction[0] < 0:  # Left
-                eyes = [(seg_center[0] - eye_offset, seg_center[1] - eye_offset // 2), (seg_center[0] - eye_offset, seg_center[1] + eye_offset // 2)]
-            elif direction[1] > 0:  # Down
-                eyes = [(seg_center[0] - eye_offset // 2, seg_center[1] + eye_offset), (seg_center[0] + eye_offset // 2, seg_center[1] + eye_offset)]
-            else:  # Up or still
-                eyes = [(seg_center[0] - eye_offset // 2, seg_center[1] - eye_offset), (seg_center[0] + eye_offset // 2, seg_center[1] - eye_offset)]
-            for eye in eyes:
-                pygame.gfxdraw.filled_circle(screen, *eye, 3, eye_color)
+    snake_sprite = circle_sprite(CELL_SIZE // 2, SNAKE_COLOR if not powerup_active else (255, 255, 0))  # Glow if powerup
+    for segment in snake:
+        blit_seq.append((snake_sprite, segment))
+
+    # Head with eyes
+    head_center = (snake[0][0] + CELL_SIZE // 2, snake[0][1] + CELL_SIZE // 2)
+    for dx, dy in EYE_OFFSETS[direction]:
+        blit_seq.append(circle_blit((head_center[0] + dx, head_center[1] + dy), 3, (255, 255, 255)))
 
     # Draw particles
-    for p in particles[:]:
-        pygame.draw.circle(screen, FOOD_COLOR, (int(p[0][0]), int(p[0][1])), p[2] // 2)
-        p[0][0] += p[1][0]
-        p[0][1] += p[1][1]
-        p[2] -= 1
-        if p[2] <= 0:
-            particles.remove(p)
+    for pos, radius in zip(p_pos.astype(int).tolist(), (p_life // 2).tolist()):
+        if radius > 0:
+            blit_seq.append(circle_blit(pos, radius, FOOD_COLOR))
+    p_pos += p_vel
+    p_life -= 1
+    alive = p_life > 0
+    if not alive.all():  # Only copy the arrays when something actually died
+        p_pos, p_vel, p_life = p_pos[alive], p_vel[alive], p_life[alive]
 
     # HUD
-    draw_text("Super Noah-Snake-Game", title_font, TITLE_COLOR, screen, 10, 10)
-    draw_text(f"Score: {score} | High: {high_score} | Level: {level}", font, TEXT_COLOR, screen, 10, HEIGHT - 40)
+    blit_seq.append((title_surf, (10, 10)))
+    if (score, high_score, level) != _last_hud_state:
+        _last_hud_state = (score, high_score, level)
+        hud_surf = font.render(f"{score} | High: {high_score} | Level: {level}", True, TEXT_COLOR).convert_alpha()
+    score_label = _render(id(font), "Score: ", TEXT_COLOR)
+    blit_seq.append((score_label, (10, HEIGHT - 40)))
+    blit_seq.append((hud_surf, (10 + score_label.get_width(), HEIGHT - 40)))
     if powerup_active:
-        draw_text("Power-Up Active!", small_font, POWERUP_COLOR, screen, WIDTH - 200, 10)
-    draw_text(f"Control: {'Joystick/Keys' if control_mode == 0 else 'MPU6050'}", small_font, TEXT_COLOR, screen, WIDTH - 200, HEIGHT - 40)
+        blit_seq.append((_render(id(small_font), "Power-Up Active!", POWERUP_COLOR), (WIDTH - 200, 10)))
+    control_text = f"Control: {'Joystick/Keys' if control_mode == 0 else 'MPU6050'}"
+    blit_seq.append((_render(id(small_font), control_text, TEXT_COLOR), (WIDTH - 200, HEIGHT - 40)))
+
+    # Game objects and HUD in one batched pass
+    dirty.extend(screen.blits(blit_seq))
 
     if game_over:
         screen.fill((100, 0, 0, 100), special_flags=pygame.BLEND_RGBA_MULT)  # Red fade
         draw_text("Game Over! You hit the edge.", font, FOOD_COLOR, screen, WIDTH // 2, HEIGHT // 2 - 50, center=True)
         draw_text(f"Final Score: {score}", font, TEXT_COLOR, screen, WIDTH // 2, HEIGHT // 2, center=True)
         draw_text("Press R to Restart", font, FOOD_COLOR, screen, WIDTH // 2, HEIGHT // 2 + 50, center=True)
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_r]:
+        if restart_pressed:
+            restart_pressed = False
+            clear_joystick_press()
             snake = [(WIDTH // 2, HEIGHT // 2)]
+            snake_cells = Counter(snake)
             direction = (0, 0)
-            food_pos = random_food_position(snake, [])
+            key_dir = (0, 0)
+            reset_free_cells(snake)
+            food_pos = random_food_position()
             food_type = 'normal'
             score = 0
             game_over = False
             level = 1
             obstacles = []
+            obstacles_set = set()
             powerup_active = False
             FPS = 4
+            full_redraw = True  # Clear the faded game over screen
 
-    pygame.display.flip()
+    if flip_frame or game_over:  # The game over fade covers the whole screen
+        pygame.display.flip()
+    else:
+        pygame.display.update(restored + dirty)
     clock.tick(FPS)
\ No newline at end of file